@@ -38,6 +38,15 @@ class BotCommands:
         self.reply_in_thread = discord_settings["reply_in_thread"]
         self.template_store = template_store
 
+        # the command tree is built once per client -- discord.py
+        # refuses to attach a second CommandTree to the same client.
+        # The sync is tracked separately: on_ready fires again on
+        # every reconnect, and a global tree.sync() is an expensive,
+        # slowly rate-limited API call, but a sync that failed should
+        # still be retried on the next on_ready.
+        self.command_tree: typing.Optional[discord.app_commands.CommandTree] = None
+        self._commands_synced = False
+
         (
             self.discrivener_location,
             self.discrivener_model_location,
@@ -80,7 +89,13 @@ class BotCommands:
     async def on_ready(self, client: discord.Client):
         """
         Register commands with Discord.
+
+        Does nothing after the first successful sync -- the registered
+        commands survive reconnects.  An unsuccessful sync is retried
+        the next time we're called.
         """
+        if self._commands_synced:
+            return
 
         async def get_messageable(
             interaction: discord.Interaction,
@@ -163,7 +178,21 @@ class BotCommands:
             # find the current message in this channel
             # tell the Repetition Tracker to hide messages
             # before this message
-            async for message in channel.history(limit=1):
+            #
+            # prefer the client's message cache over channel.history(),
+            # which costs a REST round-trip.  The cache holds the most
+            # recent messages we've seen, so on any active channel the
+            # latest message will be in it.
+            latest_message = None
+            for message in reversed(client.cached_messages):
+                if message.channel.id == channel.id:
+                    latest_message = message
+                    break
+            if latest_message is None:
+                async for message in channel.history(limit=1):
+                    latest_message = message
+
+            if latest_message is not None:
                 channel_name = discord_utils.get_channel_name(channel)
                 fancy_logger.get().info(
                     "/lobotomize called by user '%s' in #%s",
@@ -172,7 +201,7 @@ class BotCommands:
                 )
                 self.repetition_tracker.hide_messages_before(
                     channel_id=channel.id,
-                    message_id=message.id,
+                    message_id=latest_message.id,
                 )
 
             response = self.template_store.format(
@@ -192,14 +221,18 @@ class BotCommands:
             "Registering commands, sometimes this takes a while..."
         )
 
-        tree = discord.app_commands.CommandTree(client)
-        tree.add_command(lobotomize)
-        tree.add_command(say)
+        if self.command_tree is None:
+            tree = discord.app_commands.CommandTree(client)
+            tree.add_command(lobotomize)
+            tree.add_command(say)
+
+            if self.audio_commands is not None:
+                self.audio_commands.add_commands(tree)
 
-        if self.audio_commands is not None:
-            self.audio_commands.add_commands(tree)
+            self.command_tree = tree
 
-        commands = await tree.sync(guild=None)
+        commands = await self.command_tree.sync(guild=None)
+        self._commands_synced = True
         for command in commands:
             fancy_logger.get().info(
                 "Registered command: %s: %s", command.name, command.description
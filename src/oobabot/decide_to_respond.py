@@ -3,6 +3,7 @@
 Decides whether the bot responds to a message.
 """
 
+import heapq
 import random
 import typing
 
@@ -20,29 +21,39 @@ class LastReplyTimes(dict):
     RTC.  The advantage of this is that if messages are delayed,
     we'll only respond to ones that were actually sent within the
     appropriate time window.  It also makes it easier to test.
+
+    Expiry is driven by a min-heap of (timestamp, channel_id) entries,
+    so each purge pops only the channels that actually need to go,
+    instead of sorting and rebuilding the whole dict.  Heap entries
+    made stale by a newer mention in the same channel are discarded
+    lazily when they reach the top.
     """
 
     def __init__(self, cache_timeout: float, unsolicited_channel_cap: int):
         self.cache_timeout = cache_timeout
         self.unsolicited_channel_cap = unsolicited_channel_cap
+        self._expiry_heap: typing.List[typing.Tuple[float, int]] = []
+
+    def __setitem__(self, channel_id: int, send_timestamp: float) -> None:
+        super().__setitem__(channel_id, send_timestamp)
+        heapq.heappush(self._expiry_heap, (send_timestamp, channel_id))
 
     def purge_outdated(self, latest_timestamp: float) -> None:
         oldest_time_to_keep = latest_timestamp - self.cache_timeout
-
-        if self.unsolicited_channel_cap > 0:
-            # find the n-th largest timestamp
-            if self.unsolicited_channel_cap < len(self):
-                nth_largest_timestamp = sorted(self.values())[
-                    -self.unsolicited_channel_cap
-                ]
-                oldest_time_to_keep = max(oldest_time_to_keep, nth_largest_timestamp)
-        purged = {
-            channel_id: response_time
-            for channel_id, response_time in self.items()
-            if response_time >= oldest_time_to_keep
-        }
-        self.clear()
-        self.update(purged)
+        cap = self.unsolicited_channel_cap
+
+        heap = self._expiry_heap
+        while heap:
+            (response_time, channel_id) = heap[0]
+            if self.get(channel_id) != response_time:
+                # a newer mention in this channel superseded this entry
+                heapq.heappop(heap)
+                continue
+            if response_time < oldest_time_to_keep or (0 < cap < len(self)):
+                heapq.heappop(heap)
+                del self[channel_id]
+                continue
+            break
 
     def log_mention(self, channel_id: int, send_timestamp: float) -> None:
         self[channel_id] = send_timestamp
@@ -5,6 +5,9 @@ be easily extracted into a cross-platform library.
 """
 
 import asyncio
+import collections
+import logging
+import time
 import typing
 
 import discord
@@ -24,6 +27,11 @@ from oobabot import types
 
 import re
 
+# detects lines where the AI is trying to continue the conversation
+# as somebody else, e.g. "Alice says:".  Compiled once at import so
+# the per-sentence check is a single scan.
+_SPEAKER_TAIL_PATTERN = re.compile(r" (?:says|wrote|asked|replied):\s*$")
+
 
 class DiscordBot(discord.Client):
     """
@@ -31,6 +39,16 @@ class DiscordBot(discord.Client):
     and dispatches responses.
     """
 
+    # when splitting responses into separate messages, coalesce
+    # consecutive sentences into one message until either budget
+    # is hit.  Trades a little latency for far fewer REST calls.
+    SENTENCE_BATCH_MAX_CHARS = 400
+    SENTENCE_BATCH_MAX_SECONDS = 0.5
+
+    # how many generated sentences may wait in the producer/consumer
+    # queue before generation pauses for Discord sends to catch up
+    SENTENCE_QUEUE_MAXSIZE = 4
+
     def __init__(
         self,
         bot_commands: bot_commands.BotCommands,
@@ -53,6 +71,7 @@ class DiscordBot(discord.Client):
         self.response_stats = response_stats
 
         self.ai_user_id = -1
+        self._ai_name_sanitized = discord_utils.sanitize_string(persona.ai_name)
 
         self.dont_split_responses = discord_settings["dont_split_responses"]
         self.ignore_dms = discord_settings["ignore_dms"]
@@ -66,12 +85,35 @@ class DiscordBot(discord.Client):
         # add stopping_strings to stop_markers
         self.stop_markers.extend(self.ooba_client.get_stopping_strings())
 
+        # per-channel cache of the most recent raw messages, fed by
+        # on_message().  Lets us build prompts without a
+        # channel.history() API call on every reply.  Kept honest by
+        # the on_raw_message_edit/on_raw_message_delete handlers --
+        # entries warmed from a history() fetch, or evicted from
+        # discord.py's own capped message cache, would otherwise go
+        # stale, since discord.py only updates objects it still holds.
+        self._history_cache_size = (
+            self.prompt_generator.history_lines + self.MESSAGE_HISTORY_LOOKBACK_BONUS
+        )
+        self._history_cache: typing.Dict[
+            int, typing.Deque[discord.Message]
+        ] = {}
+        # channels whose cache is known to hold the full history,
+        # even if it has fewer entries than the cache size
+        self._history_cache_complete: typing.Set[int] = set()
+
         super().__init__(intents=discord_utils.get_intents())
 
     async def on_ready(self) -> None:
+        # on_ready also fires after a reconnect that had to re-IDENTIFY,
+        # and messages sent during the outage were never dispatched to
+        # on_message.  Drop the history cache so the next reply
+        # re-fetches from the API instead of serving a silent hole.
+        self._history_cache.clear()
+        self._history_cache_complete.clear()
+
         guilds = self.guilds
         num_guilds = len(guilds)
-        num_channels = sum(len(guild.channels) for guild in guilds)
 
         if self.user:
             self.ai_user_id = self.user.id
@@ -82,9 +124,13 @@ class DiscordBot(discord.Client):
         fancy_logger.get().info(
             "Connected to discord as %s (ID: %d)", user_id_str, self.ai_user_id
         )
-        fancy_logger.get().debug(
-            "monitoring %d channels across %d server(s)", num_channels, num_guilds
-        )
+        if fancy_logger.get().isEnabledFor(logging.DEBUG):
+            # walking every guild's channel list is only worth it
+            # if the result will actually be logged
+            num_channels = sum(len(guild.channels) for guild in guilds)
+            fancy_logger.get().debug(
+                "monitoring %d channels across %d server(s)", num_channels, num_guilds
+            )
         if self.ignore_dms:
             fancy_logger.get().debug("Ignoring DMs")
         else:
@@ -165,6 +211,13 @@ class DiscordBot(discord.Client):
         :param raw_message: The raw message from Discord.
         """
         try:
+            # feed the history cache before any rejection checks, so
+            # that it sees every message, including our own and those
+            # from other bots
+            self._cache_history_message(raw_message)
+
+            if not self._should_even_consider(raw_message):
+                return
             message = discord_utils.discord_message_to_generic_message(raw_message)
             should_respond, is_summon = self.decide_to_respond.should_reply_to_message(
                 self.ai_user_id, message
@@ -187,6 +240,22 @@ class DiscordBot(discord.Client):
                 "Exception while processing message: %s", err, exc_info=True
             )
 
+    def _should_even_consider(self, raw_message: discord.Message) -> bool:
+        """
+        Cheap rejection checks that need nothing but the raw message.
+
+        Most messages on a busy server are ones we'll never reply to,
+        so filter those out before paying for the conversion to a
+        GenericMessage (which sanitizes strings and builds objects).
+        """
+        if raw_message.author.bot:
+            return False
+        if self.ignore_dms and isinstance(raw_message.channel, discord.DMChannel):
+            return False
+        if not raw_message.content and not raw_message.attachments:
+            return False
+        return True
+
     async def _handle_response(
         self,
         message: types.GenericMessage,
@@ -233,10 +302,17 @@ class DiscordBot(discord.Client):
                 response_channel=response_channel,
             )
 
-        response_tasks = [
-            task for task in [message_task, image_task] if task is not None
-        ]
-        await asyncio.wait(response_tasks)
+        # message_task always exists by this point; image_task only
+        # when an image was requested.  Handle the two shapes directly
+        # rather than filtering a throwaway list.
+        if image_task is None:
+            response_tasks: typing.Tuple[asyncio.Task, ...] = (message_task,)
+        else:
+            response_tasks = (message_task, image_task)
+        # gather rather than wait: no done/pending set construction,
+        # and return_exceptions keeps one failed task from hiding
+        # the other's result
+        await asyncio.gather(*response_tasks, return_exceptions=True)
 
         # there may be more than one exception, so be sure to log
         # them all before raising either of them
@@ -244,8 +320,9 @@ class DiscordBot(discord.Client):
         for task in response_tasks:
             if task.exception() is not None:
                 fancy_logger.get().error(
-                    f"Exception while running {task.get_coro()} "
-                    + f"response: {task.exception()}",
+                    "Exception while running %s response: %s",
+                    task.get_coro(),
+                    task.exception(),
                     stack_info=True,
                 )
                 raise_later = task.exception()
@@ -272,35 +349,42 @@ class DiscordBot(discord.Client):
         If no message was sent, the task and channel will be None.
         """
         response_channel = raw_message.channel
-        if (
-            self.reply_in_thread
-            and isinstance(raw_message.channel, discord.TextChannel)
-            and isinstance(raw_message.author, discord.Member)
-        ):
-            # we want to create a response thread, if possible
-            # but we have to see if the user has permission to do so
-            # if the user can't we wont respond at all.
-            perms = raw_message.channel.permissions_for(raw_message.author)
-            if perms.create_public_threads:
-                response_channel = await raw_message.create_thread(
-                    name=f"{self.persona.ai_name}, replying to "
-                    + f"{raw_message.author.display_name}",
-                )
-                fancy_logger.get().debug(
-                    f"Created response thread {response_channel.name} "
-                    + f"({response_channel.id}) "
-                    + f"in {raw_message.channel.name}"
-                )
-            else:
-                # This user can't create threads, so we won't respond.
-                # The reason we don't respond in the channel is that
-                # it can create confusion later if a second user who
-                # DOES have thread-create permission replies to that
-                # message.  We'd end up creating a thread for that
-                # second user's response, and again for a third user,
-                # etc.
-                fancy_logger.get().debug("User can't create threads, not responding.")
-                return None
+        if self.reply_in_thread:
+            channel = raw_message.channel
+            author = raw_message.author
+            # exact-type checks are a single pointer compare, and
+            # discord.py always constructs these concrete classes
+            if (
+                type(channel) is discord.TextChannel
+                and type(author) is discord.Member
+            ):
+                # we want to create a response thread, if possible
+                # but we have to see if the user has permission to do so
+                # if the user can't we wont respond at all.
+                perms = channel.permissions_for(author)
+                if perms.create_public_threads:
+                    response_channel = await raw_message.create_thread(
+                        name=f"{self.persona.ai_name}, replying to "
+                        + f"{author.display_name}",
+                    )
+                    fancy_logger.get().debug(
+                        "Created response thread %s (%d) in %s",
+                        response_channel.name,
+                        response_channel.id,
+                        channel.name,
+                    )
+                else:
+                    # This user can't create threads, so we won't respond.
+                    # The reason we don't respond in the channel is that
+                    # it can create confusion later if a second user who
+                    # DOES have thread-create permission replies to that
+                    # message.  We'd end up creating a thread for that
+                    # second user's response, and again for a third user,
+                    # etc.
+                    fancy_logger.get().debug(
+                        "User can't create threads, not responding."
+                    )
+                    return None
 
         response_coro = self._send_text_response_in_channel(
             message=message,
@@ -400,55 +484,33 @@ class DiscordBot(discord.Client):
                 )
                 if last_sent_message is not None:
                     sent_message_count = 1
+            elif self.dont_split_responses:
+                (
+                    last_sent_message,
+                    aborted_by_us,
+                ) = await self._send_response_single(
+                    prompt_prefix,
+                    this_response_stat,
+                    response_channel,
+                    response_channel_id,
+                    allowed_mentions,
+                    reference,
+                )
+                if last_sent_message is not None:
+                    sent_message_count = 1
             else:
-                num_retries = 0
-                while sent_message_count < 1 and num_retries < 10:
-                    if self.dont_split_responses:
-                        response = await self.ooba_client.request_as_string(prompt_prefix)
-                        (
-                            last_sent_message,
-                            aborted_by_us,
-                        ) = await self._send_response_message(
-                            response,
-                            this_response_stat,
-                            response_channel,
-                            response_channel_id,
-                            allowed_mentions,
-                            reference,
-                        )
-                        if last_sent_message is None:
-                            fancy_logger.get().warning(
-                                "Retrying message due to failed response."
-                            )
-                            num_retries += 1
-                        if last_sent_message is not None:
-                            sent_message_count = 1
-                    else:
-                        sent_message_count = 0
-                        last_sent_message = None
-                        async for sentence in self.ooba_client.request_by_message(
-                            prompt_prefix
-                        ):
-                            (
-                                sent_message,
-                                abort_response,
-                            ) = await self._send_response_message(
-                                sentence,
-                                this_response_stat,
-                                response_channel,
-                                response_channel_id,
-                                allowed_mentions=allowed_mentions,
-                                reference=reference,
-                            )
-                            if sent_message is not None:
-                                last_sent_message = sent_message
-                                sent_message_count += 1
-                                # only use the reference for the first
-                                # message in a multi-message chain
-                                reference = None
-                            if abort_response:
-                                aborted_by_us = True
-                                break
+                (
+                    last_sent_message,
+                    sent_message_count,
+                    aborted_by_us,
+                ) = await self._send_response_streamed(
+                    prompt_prefix,
+                    this_response_stat,
+                    response_channel,
+                    response_channel_id,
+                    allowed_mentions,
+                    reference,
+                )
 
         except discord.DiscordException as err:
             fancy_logger.get().error("Error: %s", err, exc_info=True)
@@ -473,6 +535,184 @@ class DiscordBot(discord.Client):
         this_response_stat.write_to_log(f"Response to {message.author_name} done!  ")
         self.response_stats.log_response_success(this_response_stat)
 
+    async def _send_response_single(
+        self,
+        prompt_prefix: str,
+        this_response_stat: response_stats.ResponseStats,
+        response_channel: discord.abc.Messageable,
+        response_channel_id: int,
+        allowed_mentions: discord.AllowedMentions,
+        reference: typing.Optional[discord.MessageReference],
+    ) -> typing.Tuple[typing.Optional[discord.Message], bool]:
+        """
+        Requests the whole response as one string and posts it as a
+        single message.  Used when dont_split_responses is set, so
+        none of the per-sentence batching machinery runs.
+
+        Retries a few times if the response produced no message.
+
+        Returns the sent message (if any), and whether we aborted
+        the response.
+        """
+        last_sent_message = None
+        aborted_by_us = False
+        num_retries = 0
+        while last_sent_message is None and num_retries < 10:
+            response = await self.ooba_client.request_as_string(prompt_prefix)
+            (
+                last_sent_message,
+                aborted_by_us,
+            ) = await self._send_response_message(
+                response,
+                this_response_stat,
+                response_channel,
+                response_channel_id,
+                allowed_mentions,
+                reference,
+            )
+            if last_sent_message is None:
+                fancy_logger.get().warning("Retrying message due to failed response.")
+                num_retries += 1
+        return (last_sent_message, aborted_by_us)
+
+    async def _send_response_streamed(
+        self,
+        prompt_prefix: str,
+        this_response_stat: response_stats.ResponseStats,
+        response_channel: discord.abc.Messageable,
+        response_channel_id: int,
+        allowed_mentions: discord.AllowedMentions,
+        reference: typing.Optional[discord.MessageReference],
+    ) -> typing.Tuple[typing.Optional[discord.Message], int, bool]:
+        """
+        Streams the response sentence by sentence, coalescing
+        consecutive sentences into a single Discord message under a
+        size and time budget.  One REST call per sentence is what
+        dominates the latency of a split response.
+
+        Returns the last sent message (if any), the number of
+        messages sent, and whether we aborted the response.
+        """
+        sent_message_count = 0
+        last_sent_message = None
+        aborted_by_us = False
+
+        pending_sentences: typing.List[str] = []
+        pending_chars = 0
+        batch_started_at = 0.0
+
+        async def flush_pending() -> typing.Optional[discord.Message]:
+            nonlocal pending_chars, reference
+            if not pending_sentences:
+                return None
+            batch_text = " ".join(pending_sentences)
+            pending_sentences.clear()
+            pending_chars = 0
+            sent = await self._send_filtered_response_message(
+                batch_text,
+                this_response_stat,
+                response_channel,
+                response_channel_id,
+                allowed_mentions,
+                reference,
+            )
+            # only use the reference for the first
+            # message in a multi-message chain
+            reference = None
+            return sent
+
+        # produce sentences into a bounded queue from a separate task,
+        # so the LLM keeps generating while we're waiting on
+        # channel.send().  This hides the Discord RTT behind
+        # generation time.
+        sentence_queue: "asyncio.Queue[typing.Optional[str]]" = asyncio.Queue(
+            maxsize=self.SENTENCE_QUEUE_MAXSIZE
+        )
+
+        async def produce_sentences() -> None:
+            try:
+                async for raw_sentence in self.ooba_client.request_by_message(
+                    prompt_prefix
+                ):
+                    await sentence_queue.put(raw_sentence)
+            except asyncio.CancelledError:
+                # the consumer's cleanup cancelled us, so nobody is
+                # draining the queue anymore.  Don't block delivering
+                # a sentinel nobody will read; drop it if the queue
+                # is full.
+                try:
+                    sentence_queue.put_nowait(None)
+                except asyncio.QueueFull:
+                    pass
+                raise
+            except BaseException:
+                # the request failed.  The consumer is still draining
+                # the queue, so a blocking put is safe, and guarantees
+                # it wakes up to collect the error from our task.
+                await sentence_queue.put(None)
+                raise
+            # normal completion: the consumer may be mid-send with the
+            # queue full, so wait for a slot rather than losing the
+            # sentinel and stranding it on an untimed get()
+            await sentence_queue.put(None)
+
+        producer_task = asyncio.create_task(produce_sentences())
+        try:
+            while True:
+                if pending_sentences:
+                    # a batch is waiting, so don't let it sit past its
+                    # time budget just because the LLM is slow to
+                    # produce the next sentence -- flush on timeout
+                    time_left = self.SENTENCE_BATCH_MAX_SECONDS - (
+                        time.monotonic() - batch_started_at
+                    )
+                    try:
+                        raw_sentence = await asyncio.wait_for(
+                            sentence_queue.get(), timeout=max(time_left, 0)
+                        )
+                    except asyncio.TimeoutError:
+                        sent_message = await flush_pending()
+                        if sent_message is not None:
+                            last_sent_message = sent_message
+                            sent_message_count += 1
+                        continue
+                else:
+                    raw_sentence = await sentence_queue.get()
+                if raw_sentence is None:
+                    break
+                (sentence, abort_response) = self._filter_response(raw_sentence)
+                if sentence:
+                    if not pending_sentences:
+                        batch_started_at = time.monotonic()
+                    pending_sentences.append(sentence)
+                    pending_chars += len(sentence)
+                if abort_response:
+                    aborted_by_us = True
+                    break
+                if pending_chars >= self.SENTENCE_BATCH_MAX_CHARS:
+                    sent_message = await flush_pending()
+                    if sent_message is not None:
+                        last_sent_message = sent_message
+                        sent_message_count += 1
+        finally:
+            if not producer_task.done():
+                producer_task.cancel()
+            try:
+                # surfaces any error from the request, just as
+                # iterating it directly would
+                await producer_task
+            except asyncio.CancelledError:
+                pass
+
+        # send whatever was still batched when the response ended
+        # (or was aborted -- we still want to post the valid parts)
+        sent_message = await flush_pending()
+        if sent_message is not None:
+            last_sent_message = sent_message
+            sent_message_count += 1
+
+        return (last_sent_message, sent_message_count, aborted_by_us)
+
     def _censor_text(textfake, textreal):
         url_regex = re.compile(r'(https?\:\/\/|www\.)[a-zA-Z0-9\.\/\?\:@\-_=#]+\.([a-zA-Z]){2,6}([a-zA-Z0-9\.\&\/\?\:@\-_=#])*', re.IGNORECASE)
         text = re.sub(url_regex, "🚫🔗", textreal)
@@ -509,14 +749,45 @@ class DiscordBot(discord.Client):
         - the sent discord message, if any
         - a boolean indicating if we need to abort the response entirely
         """
-        response = self._censor_text(response)
-        (sentence, abort_response) = self._filter_immersion_breaking_lines(response)
+        (sentence, abort_response) = self._filter_response(response)
         if abort_response:
             return (None, True)
         if not sentence:
             # we can't send an empty message
             return (None, False)
 
+        response_message = await self._send_filtered_response_message(
+            sentence,
+            this_response_stat,
+            response_channel,
+            response_channel_id,
+            allowed_mentions,
+            reference,
+        )
+        return (response_message, False)
+
+    def _filter_response(self, response: str) -> typing.Tuple[str, bool]:
+        """
+        Runs the censor and the immersion-breaking-line filter over
+        a response fragment.  Returns the text that is safe to send,
+        and a boolean indicating if we should abort the response.
+        """
+        response = self._censor_text(response)
+        return self._filter_immersion_breaking_lines(response)
+
+    async def _send_filtered_response_message(
+        self,
+        sentence: str,
+        this_response_stat: response_stats.ResponseStats,
+        response_channel: discord.abc.Messageable,
+        response_channel_id: int,
+        allowed_mentions: discord.AllowedMentions,
+        reference: typing.Optional[discord.MessageReference],
+    ) -> discord.Message:
+        """
+        Posts already-filtered response text in the given channel,
+        and does the bookkeeping for the sent message.
+        """
         response_message = await response_channel.send(
             sentence,
             allowed_mentions=allowed_mentions,
@@ -525,11 +796,35 @@ class DiscordBot(discord.Client):
         )
         self.repetition_tracker.log_message(
             response_channel_id,
-            discord_utils.discord_message_to_generic_message(response_message),
+            self._sent_message_to_generic(response_message, sentence),
         )
 
         this_response_stat.log_response_part()
-        return (response_message, False)
+        return response_message
+
+    def _sent_message_to_generic(
+        self,
+        response_message: discord.Message,
+        body_text: str,
+    ) -> types.GenericMessage:
+        """
+        Build a GenericMessage for a message we've just sent ourselves.
+
+        We already know every field, so this skips re-converting the
+        raw Discord message, which would sanitize the author name and
+        body text all over again.
+        """
+        return types.GenericMessage(
+            self.ai_user_id,
+            self._ai_name_sanitized,
+            response_message.channel.id,
+            "",  # channel_name: not needed by the repetition tracker
+            response_message.id,
+            "",
+            body_text,
+            True,
+            response_message.created_at.timestamp(),
+        )
 
     async def _render_streaming_response(
         self,
@@ -586,7 +881,7 @@ class DiscordBot(discord.Client):
         if last_message is not None:
             self.repetition_tracker.log_message(
                 response_channel_id,
-                discord_utils.discord_message_to_generic_message(last_message),
+                self._sent_message_to_generic(last_message, last_message.content),
             )
 
         return last_message
@@ -610,29 +905,34 @@ class DiscordBot(discord.Client):
         good_lines = []
         previous_line = ""
         abort_response = False
+        # hoist attribute lookups out of the per-line loop; this runs
+        # for every streamed sentence, so the LOAD_ATTR chains add up
+        bot_prompt_line = self.prompt_generator.bot_prompt_line
+        stop_markers = self.stop_markers
+        logger = fancy_logger.get()
         for line in lines:
             # if the AI gives itself a second line, just ignore
             # the line instruction and continue
-            if self.prompt_generator.bot_prompt_line == line:
-                fancy_logger.get().warning(
+            if bot_prompt_line == line:
+                logger.warning(
                     "Filtered out %s from response, continuing", line
                 )
                 continue
 
             # hack: abort response if it looks like the AI is
             # continuing the conversation as someone else
-            if line.endswith(" says:"):
-                fancy_logger.get().warning(
+            if _SPEAKER_TAIL_PATTERN.search(line):
+                logger.warning(
                     'Filtered out "%s" from response, aborting', line
                 )
                 abort_response = True
                 break
 
             # look for partial stop markers within a line
-            for marker in self.stop_markers:
+            for marker in stop_markers:
                 if marker in line:
                     (keep_part, removed) = line.split(marker, 1)
-                    fancy_logger.get().warning(
+                    logger.warning(
                         'Filtered out "%s" from response, aborting',
                         removed,
                     )
@@ -708,14 +1008,16 @@ class DiscordBot(discord.Client):
         )
         return (generic_message, True)
 
-    async def _filtered_history_iterator(
+    async def _filtered_history(
         self,
         async_iter_history: typing.AsyncIterator[discord.Message],
         stop_before_message_id: typing.Optional[int],
         ignore_all_until_message_id: typing.Optional[int],
         limit: int,
-    ) -> typing.AsyncIterator[types.GenericMessage]:
+    ) -> typing.List[types.GenericMessage]:
         """
+        Collects the filtered history into a list, newest first.
+
         When returning the history of a thread, Discord
         does not include the message that kicked off the thread.
 
@@ -724,13 +1026,17 @@ class DiscordBot(discord.Client):
 
         This method attempts to return that message as well,
         if we need it.
+
+        This deliberately returns a list rather than being an async
+        generator -- the consumer wants all of the messages anyway,
+        and a plain list avoids a coroutine suspension per message.
         """
-        items = 0
+        messages: typing.List[types.GenericMessage] = []
         last_returned = None
         ignoring_all = ignore_all_until_message_id is not None
         async for item in async_iter_history:
-            if items >= limit:
-                return
+            if len(messages) >= limit:
+                return messages
 
             if ignoring_all:
                 if item.id == ignore_all_until_message_id:
@@ -750,17 +1056,16 @@ class DiscordBot(discord.Client):
             if not allow_more:
                 # we've hit a message which requires us to stop
                 # and look at more history
-                return
+                return messages
             if sanitized_message is not None:
-                yield sanitized_message
-                items += 1
+                messages.append(sanitized_message)
 
-        if last_returned is not None and items < limit:
+        if last_returned is not None and len(messages) < limit:
             # we've reached the beginning of the history, but
             # still have space.  If this message was a reply
             # to another message, return that message as well.
             if last_returned.reference is None:
-                return
+                return messages
 
             ref = last_returned.reference.resolved
 
@@ -772,7 +1077,8 @@ class DiscordBot(discord.Client):
                     stop_before_message_id,
                 )
                 if sanitized_message is not None:
-                    yield sanitized_message
+                    messages.append(sanitized_message)
+        return messages
 
     # when looking through the history of a channel, we'll have a goal
     # of retrieving a certain number of lines of history.  However,
@@ -793,19 +1099,102 @@ class DiscordBot(discord.Client):
     # to keep it reasonable.
     MESSAGE_HISTORY_LOOKBACK_BONUS = 20
 
+    def _cache_history_message(self, raw_message: discord.Message) -> None:
+        """
+        Record a message in the per-channel history cache.
+
+        Called from on_message() for every message we see.
+        """
+        channel_cache = self._history_cache.get(raw_message.channel.id)
+        if channel_cache is None:
+            channel_cache = collections.deque(maxlen=self._history_cache_size)
+            self._history_cache[raw_message.channel.id] = channel_cache
+        channel_cache.append(raw_message)
+
+    async def on_raw_message_edit(
+        self, payload: discord.RawMessageUpdateEvent
+    ) -> None:
+        """
+        Keeps the history cache honest about edits.  Cached entries
+        that discord.py no longer tracks (warmed from a history()
+        fetch, or evicted from its own message cache) would otherwise
+        keep their pre-edit content in prompts.
+        """
+        channel_cache = self._history_cache.get(payload.channel_id)
+        if channel_cache is None:
+            return
+        content = payload.data.get("content")
+        if content is None:
+            return
+        for message in channel_cache:
+            if message.id == payload.message_id:
+                message.content = content
+                break
+
+    async def on_raw_message_delete(
+        self, payload: discord.RawMessageDeleteEvent
+    ) -> None:
+        """
+        Keeps the history cache honest about deletions, so deleted
+        messages don't keep appearing in prompts.  The raw event fires
+        even for messages discord.py itself no longer has cached.
+        """
+        channel_cache = self._history_cache.get(payload.channel_id)
+        if channel_cache is None:
+            return
+        for message in channel_cache:
+            if message.id == payload.message_id:
+                channel_cache.remove(message)
+                break
+
+    async def _channel_history(
+        self,
+        channel: discord.abc.Messageable,
+        limit: int,
+    ) -> typing.AsyncIterator[discord.Message]:
+        """
+        Returns the most recent messages in the channel, newest first.
+
+        Serves from the in-memory cache kept up to date by on_message()
+        when possible.  On a cold cache (e.g. right after startup, or
+        for a freshly-created thread), falls back to a channel.history()
+        API call and warms the cache with its results.
+        """
+        channel_id = channel.id if hasattr(channel, "id") else None
+        if channel_id is not None:
+            channel_cache = self._history_cache.get(channel_id)
+            if channel_cache is not None and (
+                len(channel_cache) == channel_cache.maxlen
+                or channel_id in self._history_cache_complete
+            ):
+                for message in reversed(channel_cache):
+                    yield message
+                return
+
+        fetched = [message async for message in channel.history(limit=limit)]
+        if channel_id is not None:
+            self._history_cache[channel_id] = collections.deque(
+                reversed(fetched), maxlen=self._history_cache_size
+            )
+            if len(fetched) < limit:
+                # the channel has fewer messages than we asked for,
+                # so the cache now holds its entire history
+                self._history_cache_complete.add(channel_id)
+        for message in fetched:
+            yield message
+
     async def _recent_messages_following_thread(
         self,
         channel: discord.abc.Messageable,
         stop_before_message_id: typing.Optional[int],
         ignore_all_until_message_id: typing.Optional[int],
         num_history_lines: int,
-    ) -> typing.AsyncIterator[types.GenericMessage]:
+    ) -> typing.List[types.GenericMessage]:
         max_messages_to_check = num_history_lines + self.MESSAGE_HISTORY_LOOKBACK_BONUS
-        history = channel.history(limit=max_messages_to_check)
-        result = self._filtered_history_iterator(
+        history = self._channel_history(channel, limit=max_messages_to_check)
+        return await self._filtered_history(
             history,
             limit=num_history_lines,
             stop_before_message_id=stop_before_message_id,
             ignore_all_until_message_id=ignore_all_until_message_id,
         )
-        return result
@@ -20,8 +20,20 @@ import discord
 from oobabot import fancy_logger
 from oobabot import types
 
-FORBIDDEN_CHARACTERS = r"[\n\r\t]"
-FORBIDDEN_CHARACTERS_PATTERN = re.compile(FORBIDDEN_CHARACTERS)
+# characters that would confuse the AI, mapped to plain spaces.
+# str.translate dispatches in C, and returns the original string
+# untouched when none of these characters appear.
+_SANITIZE_TRANS = str.maketrans({"\n": " ", "\r": " ", "\t": " "})
+
+# channel types whose messages we treat as ChannelMessages.  A single
+# module-level tuple keeps the per-message isinstance check to one
+# C-level traversal.
+_CHANNEL_LIKE = (
+    discord.TextChannel,
+    discord.GroupChannel,
+    discord.Thread,
+    discord.VoiceChannel,
+)
 
 
 def get_channel_name(channel: discord.abc.Messageable) -> str:
@@ -40,7 +52,7 @@ def sanitize_string(raw_string: str) -> str:
     """
     Filter out any characters that would confuse the AI
     """
-    return FORBIDDEN_CHARACTERS_PATTERN.sub(" ", raw_string)
+    return raw_string.translate(_SANITIZE_TRANS)
 
 
 def discord_message_to_generic_message(
@@ -60,39 +72,41 @@ def discord_message_to_generic_message(
     else:
         body_text = sanitize_string(raw_message.content)
 
-    generic_args = {
-        "author_id": raw_message.author.id,
-        "author_name": sanitize_string(raw_message.author.display_name),
-        "channel_id": raw_message.channel.id,
-        "channel_name": get_channel_name(raw_message.channel),
-        "message_id": raw_message.id,
-        "body_text": body_text,
-        "author_is_bot": raw_message.author.bot,
-        "send_timestamp": raw_message.created_at.timestamp(),
-        "reference_message_id": raw_message.reference.message_id
-        if raw_message.reference
-        else "",
-    }
-    if isinstance(raw_message.channel, discord.DMChannel):
-        return types.DirectMessage(**generic_args)
-    if isinstance(
-        raw_message.channel,
-        (
-            discord.TextChannel,
-            discord.GroupChannel,
-            discord.Thread,
-            discord.VoiceChannel,
-        ),
-    ):
+    channel = raw_message.channel
+    author = raw_message.author
+    # positional args, in GenericMessage.__init__ order.  Skipping the
+    # dict + **kwargs splat saves an allocation per message.
+    generic_args = (
+        author.id,
+        sanitize_string(author.display_name),
+        channel.id,
+        get_channel_name(channel),
+        raw_message.id,
+        raw_message.reference.message_id if raw_message.reference else "",
+        body_text,
+        author.bot,
+        raw_message.created_at.timestamp(),
+    )
+    if isinstance(channel, discord.DMChannel):
+        return types.DirectMessage(*generic_args)
+    if isinstance(channel, _CHANNEL_LIKE):
+        # most messages have no mentions, so reuse the shared empty
+        # tuple rather than allocating a fresh list every time
+        mentions = (
+            tuple(mention.id for mention in raw_message.mentions)
+            if raw_message.mentions
+            else ()
+        )
         return types.ChannelMessage(
-            mentions=[mention.id for mention in raw_message.mentions],
-            **generic_args,
+            mentions,
+            *generic_args,
         )
     fancy_logger.get().warning(
-        f"Unknown channel type {type(raw_message.channel)}, "
-        + f"unsolicited replies disabled.: {raw_message.channel}"
+        "Unknown channel type %s, unsolicited replies disabled.: %s",
+        type(channel),
+        channel,
     )
-    return types.GenericMessage(**generic_args)
+    return types.GenericMessage(*generic_args)
 
 
 def replace_mention_ids_with_names(
@@ -234,11 +234,16 @@ class OobaClient(http_client.SerializedHttpClient):
         }
         request.update(self.request_params)
 
+        # bind the debug flag to a local once; the per-token loop below
+        # shouldn't pay an attribute lookup per token for a setting
+        # that is off in normal operation
+        log_all_the_things = self.log_all_the_things
+
         async with self._get_session().ws_connect(
             self.OOBABOOGA_STREAMING_URI_PATH
         ) as websocket:
             await websocket.send_json(request)
-            if self.log_all_the_things:
+            if log_all_the_things:
                 try:
                     print(f"Sent request:\n{json.dumps(request, indent=1)}")
                     print(f"Prompt:\n{str(request['prompt'])}")
@@ -268,7 +273,7 @@ class OobaClient(http_client.SerializedHttpClient):
                         self.total_response_tokens += 1
                         text = incoming_data["text"]
                         if text != SentenceSplitter.END_OF_INPUT:
-                            if self.log_all_the_things:
+                            if log_all_the_things:
                                 try:
                                     print(text, end="", flush=True)
                                 except UnicodeEncodeError:
@@ -278,7 +283,7 @@ class OobaClient(http_client.SerializedHttpClient):
 
                     elif "stream_end" == incoming_data["event"]:
                         # Make sure any unprinted text is flushed.
-                        if self.log_all_the_things:
+                        if log_all_the_things:
                             print("", flush=True)
                         yield SentenceSplitter.END_OF_INPUT
                         return
@@ -118,9 +118,9 @@ class PromptGenerator:
             )
         self.max_history_chars = available_chars_for_history
 
-    async def _render_history(
+    def _render_history(
         self,
-        message_history: typing.AsyncIterator[types.GenericMessage],
+        message_history: typing.Iterable[types.GenericMessage],
     ) -> str:
         # add on more history, but only if we have room
         # if we don't have room, we'll just truncate the history
@@ -135,7 +135,7 @@ class PromptGenerator:
         # reverse order
         history_lines = []
 
-        async for message in message_history:
+        for message in message_history:
             if not message.body_text:
                 continue
 
@@ -184,7 +184,12 @@ class PromptGenerator:
 
     async def generate(
         self,
-        message_history: typing.Optional[typing.AsyncIterator[types.GenericMessage]],
+        message_history: typing.Optional[
+            typing.Union[
+                typing.Iterable[types.GenericMessage],
+                typing.AsyncIterator[types.GenericMessage],
+            ]
+        ],
         image_requested: bool,
         guild_name: str,
         response_channel: str,
@@ -194,7 +199,9 @@ class PromptGenerator:
         """
         message_history_txt = ""
         if message_history is not None:
-            message_history_txt = await self._render_history(
+            if hasattr(message_history, "__aiter__"):
+                message_history = [message async for message in message_history]
+            message_history_txt = self._render_history(
                 message_history,
             )
         image_coming = self.image_request_made if image_requested else ""
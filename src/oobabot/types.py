@@ -14,6 +14,20 @@ class GenericMessage:
     Represents a message from a user.
     """
 
+    # one of these is created for every message we see, so skip
+    # the per-instance __dict__
+    __slots__ = (
+        "author_id",
+        "author_name",
+        "message_id",
+        "body_text",
+        "author_is_bot",
+        "reference_message_id",
+        "send_timestamp",
+        "channel_id",
+        "channel_name",
+    )
+
     def __init__(
         self,
         author_id: int,
@@ -45,6 +59,8 @@ class DirectMessage(GenericMessage):
     Represents a message sent directly to the bot.
     """
 
+    __slots__ = ()
+
 
 class ChannelMessage(GenericMessage):
     """
@@ -52,13 +68,16 @@ class ChannelMessage(GenericMessage):
     a private group chat or thread.
     """
 
+    __slots__ = ("mentions",)
+
     def __init__(
         self,
         /,
-        mentions: typing.List[int],
+        mentions: typing.Sequence[int],
+        *args,
         **kwargs,
     ):
-        super().__init__(**kwargs)  # type: ignore
+        super().__init__(*args, **kwargs)  # type: ignore
         self.mentions = mentions
 
     def is_mentioned(self, user_id: int) -> bool:
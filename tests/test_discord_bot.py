@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the streamed-response producer/consumer machinery.
+"""
+
+import asyncio
+import datetime
+
+import pytest
+
+from oobabot import discord_bot
+from oobabot import repetition_tracker
+from oobabot import response_stats
+
+
+class FakePromptGenerator:
+    bot_prompt_line = "TestBot says:"
+
+
+class FakeSentMessage:
+    def __init__(self, content, channel):
+        self.id = 42
+        self.content = content
+        self.channel = channel
+        self.created_at = datetime.datetime.now(datetime.timezone.utc)
+
+
+class FakeChannel:
+    """
+    A channel whose send() is slow, like a real Discord REST call.
+    """
+
+    def __init__(self, send_delay: float):
+        self.id = 123
+        self.send_delay = send_delay
+        self.sent = []
+
+    async def send(self, content, **_kwargs):
+        await asyncio.sleep(self.send_delay)
+        self.sent.append(content)
+        return FakeSentMessage(content, self)
+
+
+class FakeOobaClient:
+    """
+    Yields a fixed list of sentences, fast, then optionally raises.
+    """
+
+    def __init__(self, sentences, error=None):
+        self.sentences = sentences
+        self.error = error
+
+    async def request_by_message(self, _prompt):
+        for sentence in self.sentences:
+            yield sentence
+        if self.error is not None:
+            raise self.error
+
+
+def make_bot(ooba_client) -> discord_bot.DiscordBot:
+    # construct without __init__ to avoid discord.Client setup;
+    # set only the attributes _send_response_streamed touches
+    bot = discord_bot.DiscordBot.__new__(discord_bot.DiscordBot)
+    bot.ooba_client = ooba_client
+    bot.prompt_generator = FakePromptGenerator()
+    bot.stop_markers = []
+    bot.repetition_tracker = repetition_tracker.RepetitionTracker(
+        repetition_threshold=3
+    )
+    bot.ai_user_id = 1
+    bot._ai_name_sanitized = "TestBot"
+    return bot
+
+
+def run_streamed(bot, channel):
+    stats = response_stats.ResponseStats(lambda: 0, "")
+
+    async def go():
+        return await bot._send_response_streamed(
+            "prompt",
+            stats,
+            channel,
+            channel.id,
+            None,
+            None,
+        )
+
+    # wait_for: a regression here is a hang, not a failure
+    return asyncio.run(asyncio.wait_for(go(), timeout=5.0))
+
+
+def test_streamed_response_completes_when_generator_outruns_sends():
+    # regression test: the LLM finishes while the consumer is stuck in
+    # a slow send() and the bounded queue is full.  The end-of-response
+    # sentinel must still arrive, or the consumer blocks forever.
+    sentences = ["a" * 150 for _ in range(7)]
+    channel = FakeChannel(send_delay=0.05)
+    bot = make_bot(FakeOobaClient(sentences))
+
+    (last_sent, sent_count, aborted) = run_streamed(bot, channel)
+
+    assert last_sent is not None
+    assert not aborted
+    assert sent_count == len(channel.sent)
+    # every character made it out, however the batching grouped them
+    assert sum(batch.count("a") for batch in channel.sent) == 7 * 150
+
+
+def test_streamed_response_raises_when_request_fails():
+    # a failing request must surface its error to the caller rather
+    # than stranding the consumer on an empty queue
+    sentences = ["b" * 150 for _ in range(5)]
+    channel = FakeChannel(send_delay=0.05)
+    bot = make_bot(FakeOobaClient(sentences, error=RuntimeError("llm died")))
+
+    with pytest.raises(RuntimeError):
+        run_streamed(bot, channel)